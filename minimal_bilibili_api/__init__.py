@@ -4,8 +4,8 @@ minimal_bilibili_api
 精简版哔哩哔哩 API，仅保留登录、收藏夹、音频下载、视频标题功能
 """
 
-from .utils.network import Credential, Api
-from .login import QRCodeLogin
+from .utils.network import Credential, Api, close_session, set_max_clients
+from .login import QRCodeLogin, login_with_qr
 from .favorite_list import FavoriteList, get_video_favorite_list, get_video_favorite_list_content
 from .video import Video, get_video_title
 
@@ -14,7 +14,10 @@ __version__ = "1.0.0"
 __all__ = [
     "Credential",
     "Api",
+    "close_session",
+    "set_max_clients",
     "QRCodeLogin",
+    "login_with_qr",
     "FavoriteList",
     "get_video_favorite_list",
     "get_video_favorite_list_content",
@@ -11,7 +11,8 @@ from minimal_bilibili_api import (
     get_video_favorite_list,
     Video,
     get_video_title,
-    Credential
+    Credential,
+    close_session
 )
 
 
@@ -90,18 +91,21 @@ async def main():
     print("🚀 Minimal Bilibili API 演示程序")
     print("=" * 50)
 
-    # 1. 演示进行登录
-    credential = Credential()
-    if not credential:
-        return
+    try:
+        # 1. 演示进行登录
+        credential = Credential()
+        if not credential:
+            return
 
-    # 2. 收藏夹功能
-    # await demo_favorite_list(credential)
+        # 2. 收藏夹功能
+        # await demo_favorite_list(credential)
 
-    # 3. 视频功能
-    await demo_video(credential)
+        # 3. 视频功能
+        await demo_video(credential)
 
-    print("\n🎉 演示完成!")
+        print("\n🎉 演示完成!")
+    finally:
+        await close_session()
 
 
 if __name__ == "__main__":
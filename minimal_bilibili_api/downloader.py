@@ -7,16 +7,24 @@ minimal_bilibili_api.downloader
 import os
 import asyncio
 from pathlib import Path
-from typing import List, Optional, Callable, Union
+from typing import List, Optional, Callable, Tuple, Union
 from dataclasses import dataclass
 from urllib.parse import urlparse
 import time
+import warnings
 
-from .utils.network import get_client, HEADERS
-from .video import Video, AudioStream
+from .utils.network import (
+    METADATA_CONCURRENCY, download_slots, get_client, get_session, set_max_clients
+)
+from .utils.utils import DATACLASS_SLOTS
+from .video import Video, AudioStream, VideoDownloadParser
 
 
-@dataclass
+# 文件名非法字符替换表
+_INVALID_FILENAME_TABLE = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
+
+
+@dataclass(**DATACLASS_SLOTS)
 class DownloadTask:
     """下载任务"""
     url: str
@@ -42,14 +50,37 @@ class ProgressCallback:
 class Downloader:
     """精简下载管理器"""
     
-    def __init__(self, max_concurrent: int = 3):
+    def __init__(self, max_concurrent: Optional[int] = None, connector_limit: Optional[int] = None):
         """
+        多个下载器应共享同一个 Downloader 实例，信号量才能限制总并发数
+
+        下载并发数的上限由连接池大小决定（见 download_slots），
+        需要更多并发下载时应增大 connector_limit
+
         Args:
-            max_concurrent (int): 最大并发下载数
+            max_concurrent (int): 最大并发下载数，为空时使用 download_slots()
+            connector_limit (int): 共享会话的连接池大小，为空时保持当前设置；
+                会话已创建时发出警告，见 set_max_clients
         """
+        if connector_limit is not None:
+            set_max_clients(connector_limit)
+        slots = download_slots()
+        if max_concurrent is None:
+            max_concurrent = slots
+        elif max_concurrent > slots:
+            warnings.warn(
+                f"最大并发下载数 {max_concurrent} 超过连接池允许的 {slots}，"
+                f"请增大 connector_limit",
+                stacklevel=2
+            )
+            max_concurrent = slots
         self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.client = get_client()
+
+    @property
+    def session(self):
+        """与 Api 共用的会话"""
+        return get_session()
     
     async def download_single(self, url: str, filepath: str, 
                             progress_callback: Optional[ProgressCallback] = None) -> bool:
@@ -78,26 +109,18 @@ class Downloader:
             if progress_callback:
                 progress_callback(task)
             
-            # 创建下载任务
-            dwn_id = await self.client.download_create(url, HEADERS)
-            
-            # 获取文件大小
-            task.total_size = self.client.download_content_length(dwn_id)
-            
-            # 写入文件
-            with open(filepath, "wb") as f:
-                while True:
-                    chunk = await self.client.download_chunk(dwn_id)
-                    if not chunk:
-                        break
-                    
-                    f.write(chunk)
-                    task.downloaded += len(chunk)
-                    
-                    if progress_callback:
-                        progress_callback(task)
-            
-            await self.client.download_close(dwn_id)
+            def on_progress(downloaded: int, total_size: int):
+                task.downloaded = downloaded
+                task.total_size = total_size
+                if progress_callback:
+                    progress_callback(task)
+
+            # 流式下载并写入文件
+            task.downloaded = await get_client().download_to_file(
+                url, filepath, on_progress=on_progress, session=self.session
+            )
+            task.total_size = task.total_size or task.downloaded
+
             task.status = "completed"
             
             if progress_callback:
@@ -137,62 +160,87 @@ class Downloader:
 class VideoDownloader:
     """视频专用下载器"""
     
-    def __init__(self, video: Video, download_dir: str = "./downloads"):
+    def __init__(self, video: Video, download_dir: str = "./downloads",
+                 downloader: Optional[Downloader] = None):
         """
         Args:
             video (Video): 视频对象
             download_dir (str): 下载目录
+            downloader (Downloader): 共享的下载管理器，为空时新建
         """
         self.video = video
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.downloader = Downloader()
+        self.downloader = downloader if downloader else Downloader()
     
     def sanitize_filename(self, filename: str) -> str:
         """清理文件名中的非法字符"""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename.strip()
+        return filename.translate(_INVALID_FILENAME_TABLE).strip()
     
-    async def download_audio(self, page_index: int = 0, 
-                           quality: Optional[str] = None,
-                           filename: Optional[str] = None,
-                           progress_callback: Optional[ProgressCallback] = None) -> str:
+    async def resolve_audio(self, page_index: int = 0,
+                            quality: Optional[str] = None,
+                            filename: Optional[str] = None) -> Tuple[AudioStream, str]:
         """
-        下载音频
+        解析要下载的音频流和保存路径（仅请求元数据，不下载）
         
         Args:
             page_index (int): 分P索引
             quality (str): 指定音质 ('64K', '132K', '192K', 'HI_RES', 'DOLBY')
             filename (str): 自定义文件名
-            progress_callback (ProgressCallback): 进度回调
             
         Returns:
-            str: 下载文件路径
+            Tuple[AudioStream, str]: (音频流, 文件路径)
         """
-        # 获取音频流
+        # 需要标题时与下载链接并发请求；标题请求先发起，下载链接可直接复用其中的分 P 信息
+        if filename:
+            download_data = await self.video.get_download_url(page_index)
+        else:
+            title, download_data = await asyncio.gather(
+                self.video.get_title(),
+                self.video.get_download_url(page_index)
+            )
+
+        # 获取音频流（下载链接只请求并解析一次）
+        parser = VideoDownloadParser(download_data)
         if quality:
-            audio_streams = await self.video.get_audio_streams(page_index)
             target_stream = None
-            for stream in audio_streams:
+            for stream in parser.get_audio_streams():
                 if stream.quality.name == quality:
                     target_stream = stream
                     break
             if not target_stream:
                 raise Exception(f"未找到指定音质: {quality}")
         else:
-            target_stream = await self.video.get_best_audio_stream(page_index)
+            target_stream = parser.get_best_audio_stream()
             if not target_stream:
                 raise Exception("未找到可用的音频流")
         
         # 生成文件名
         if not filename:
-            title = await self.video.get_title()
+            # 带上视频编号，避免收藏夹中同名视频并发下载到同一路径
             clean_title = self.sanitize_filename(title)
-            filename = f"{clean_title}_p{page_index+1}_{target_stream.quality.name}.m4a"
+            video_id = self.video.bvid or f"av{self.video.aid}"
+            filename = f"{clean_title}_{video_id}_p{page_index+1}_{target_stream.quality.name}.m4a"
         
-        filepath = str(self.download_dir / filename)
+        return target_stream, str(self.download_dir / filename)
+    
+    async def download_audio(self, page_index: int = 0, 
+                           quality: Optional[str] = None,
+                           filename: Optional[str] = None,
+                           progress_callback: Optional[ProgressCallback] = None) -> str:
+        """
+        下载音频
+        
+        Args:
+            page_index (int): 分P索引
+            quality (str): 指定音质 ('64K', '132K', '192K', 'HI_RES', 'DOLBY')
+            filename (str): 自定义文件名
+            progress_callback (ProgressCallback): 进度回调
+            
+        Returns:
+            str: 下载文件路径
+        """
+        target_stream, filepath = await self.resolve_audio(page_index, quality, filename)
         
         # 下载
         success = await self.downloader.download_single(
@@ -228,6 +276,8 @@ class FavoriteListDownloader:
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.downloader = Downloader()
         self.video_downloader_class = VideoDownloader
+        self.metadata_semaphore = asyncio.Semaphore(METADATA_CONCURRENCY)
+        self._finished = 0
     
     async def download_all_audios(self, 
                                 max_videos: Optional[int] = None,
@@ -242,30 +292,46 @@ class FavoriteListDownloader:
             progress_callback (Callable[[int, int, str], None]): 进度回调
             
         Returns:
-            dict: {media_id: filepath}
+            dict: {bvid: 文件路径或错误信息}
         """
-        results = {}
         videos = await self.fav_list.get_videos()
-        total_videos = len(videos)
         if max_videos:
-            total_videos = min(total_videos, max_videos)
-        
-        for i, video in enumerate(videos[:total_videos]):
-            media_id = video.media_id
-            video_downloader = self.video_downloader_class(video, self.download_dir)
-            try:
-                filepath = await video_downloader.download_audio(
-                    quality=quality,
-                    progress_callback=progress_callback
-                )
-                results[media_id] = filepath
-            except Exception as e:
-                results[media_id] = str(e)
-            
-            if progress_callback:
-                progress_callback(i+1, total_videos, filepath)
-        
-        return results
+            videos = videos[:max_videos]
+
+        self._finished = 0
+        results = await asyncio.gather(*[
+            self._download_one(video, len(videos), quality, progress_callback)
+            for video in videos
+        ])
+        return {video.bvid: result for video, result in zip(videos, results)}
+
+    async def _download_one(self, video: Video, total_videos: int,
+                            quality: Optional[str] = None,
+                            progress_callback: Optional[Callable[[int, int, str], None]] = None) -> str:
+        """
+        下载单个视频的音频
+
+        元数据请求和文件下载分别受各自的信号量限制，
+        因此后续视频的元数据可以在前面的视频下载时并发获取
+
+        Returns:
+            str: 下载文件路径，失败时为错误信息
+        """
+        video_downloader = self.video_downloader_class(video, self.download_dir, self.downloader)
+        try:
+            async with self.metadata_semaphore:
+                stream, filepath = await video_downloader.resolve_audio(quality=quality)
+
+            async with self.downloader.semaphore:
+                success = await self.downloader.download_single(stream.url, filepath)
+            result = filepath if success else "下载失败"
+        except Exception as e:
+            result = str(e)
+
+        self._finished += 1
+        if progress_callback:
+            progress_callback(self._finished, total_videos, result)
+        return result
 
 
 async def download_favorite_list_audios(media_id: int,
@@ -284,7 +350,7 @@ async def download_favorite_list_audios(media_id: int,
         progress_callback (Callable[[int, int, str], None]): 进度回调
         
     Returns:
-        dict: {media_id: filepath}
+        dict: {bvid: 文件路径或错误信息}
     """
     from .favorite_list import FavoriteList
     fav_list = FavoriteList(media_id)
@@ -4,13 +4,22 @@ minimal_bilibili_api.favorite_list
 收藏夹相关功能
 """
 
+import asyncio
+import math
 from enum import Enum
 from typing import List, Union, Optional
 from .utils.utils import get_api
-from .utils.network import Api, Credential
+from .utils.network import METADATA_CONCURRENCY, Api, Credential
+from .video import Video
 
 
 API = get_api("favorite-list")
+_INFO_API = API["info"]["info"]
+_LIST_LIST_API = API["info"]["list_list"]
+_LIST_CONTENT_API = API["info"]["list_content"]
+
+# 收藏夹内容每页条数
+PAGE_SIZE = 20
 
 
 class FavoriteListContentOrder(Enum):
@@ -27,6 +36,8 @@ class FavoriteList:
     收藏夹类
     """
 
+    __slots__ = ("media_id", "credential")
+
     def __init__(self, media_id: int, credential: Credential = None):
         """
         Args:
@@ -43,9 +54,8 @@ class FavoriteList:
         Returns:
             dict: 收藏夹信息
         """
-        api = API["info"]["info"]
         params = {"media_id": self.media_id}
-        return await Api(**api, credential=self.credential).update_params(**params).result()
+        return await Api(**_INFO_API, credential=self.credential).update_params(params).result()
 
     async def get_content(
         self,
@@ -72,6 +82,54 @@ class FavoriteList:
             credential=self.credential
         )
 
+    async def get_all_pages(
+        self,
+        keyword: str = None,
+        order: FavoriteListContentOrder = FavoriteListContentOrder.MTIME
+    ) -> List[dict]:
+        """
+        获取收藏夹全部分页内容
+
+        先获取第一页得到总数，其余页并发请求，并发数不超过 METADATA_CONCURRENCY
+
+        Args:
+            keyword (str): 搜索关键词
+            order (FavoriteListContentOrder): 排序方式
+
+        Returns:
+            List[dict]: 按页码顺序排列的各页内容
+        """
+        first = await self.get_content(page=1, keyword=keyword, order=order)
+        count = (first.get("data") or {}).get("info", {}).get("media_count", 0)
+        last = max(1, math.ceil(count / PAGE_SIZE))
+
+        semaphore = asyncio.Semaphore(METADATA_CONCURRENCY)
+
+        async def fetch(page: int) -> dict:
+            async with semaphore:
+                return await self.get_content(page=page, keyword=keyword, order=order)
+
+        rest = await asyncio.gather(*[fetch(page) for page in range(2, last + 1)])
+        return [first, *rest]
+
+    async def get_videos(self) -> List[Video]:
+        """
+        获取收藏夹中的所有视频
+
+        Returns:
+            List[Video]: 视频对象列表
+        """
+        videos = []
+        for page in await self.get_all_pages():
+            medias = (page.get("data") or {}).get("medias") or []
+            for media in medias:
+                bvid = media.get("bvid") or media.get("bv_id")
+                if bvid:
+                    # 列表中已包含标题，预先填入以省去每个视频单独请求视频信息
+                    videos.append(Video(bvid=bvid, credential=self.credential,
+                                        title=media.get("title")))
+        return videos
+
     async def download_all_audios(self, 
                                 download_dir: str = "./downloads",
                                 max_videos: int = None,
@@ -89,15 +147,14 @@ class FavoriteList:
         Returns:
             dict: 下载结果统计
         """
-        from .downloader import FavoriteListDownloader, ProgressCallback
+        from .downloader import FavoriteListDownloader
         
         downloader = FavoriteListDownloader(self, download_dir)
-        progress_cb = ProgressCallback(progress_callback) if progress_callback else None
         
         return await downloader.download_all_audios(
             max_videos=max_videos,
             quality=quality,
-            progress_callback=progress_cb
+            progress_callback=progress_callback
         )
 
 
@@ -115,9 +172,8 @@ async def get_video_favorite_list(
     Returns:
         dict: 收藏夹列表
     """
-    api = API["info"]["list_list"]
     params = {"up_mid": uid, "type": 2}
-    return await Api(**api, credential=credential).update_params(**params).result()
+    return await Api(**_LIST_LIST_API, credential=credential).update_params(params).result()
 
 
 async def get_video_favorite_list_content(
@@ -140,11 +196,10 @@ async def get_video_favorite_list_content(
     Returns:
         dict: 收藏夹内容
     """
-    api = API["info"]["list_content"]
     params = {
         "media_id": media_id,
         "pn": page,
-        "ps": 20,
+        "ps": PAGE_SIZE,
         "order": order.value,
         "type": 0,
         "tid": 0
@@ -153,4 +208,4 @@ async def get_video_favorite_list_content(
     if keyword:
         params["keyword"] = keyword
 
-    return await Api(**api, credential=credential).update_params(**params).result()
+    return await Api(**_LIST_CONTENT_API, credential=credential).update_params(params).result()
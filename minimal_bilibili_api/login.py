@@ -7,14 +7,58 @@ minimal_bilibili_api.login
 import json
 import time
 import asyncio
+import importlib
 import qrcode
 import qrcode_terminal
 from typing import Union
+from urllib.parse import urlsplit
 from .utils.utils import get_api
 from .utils.network import Api, Credential
 
 
 API = get_api("login")
+_QR_GET = API["qrcode"]["web"]["get_qrcode_and_token"]
+_QR_EVENTS = API["qrcode"]["web"]["get_events"]
+
+# 登录前请求使用的空凭据，只读共享
+_ANON_CRED = Credential()
+
+# 二维码登录状态码
+CODE_NOT_SCANNED = 86101
+CODE_NOT_CONFIRMED = 86090
+CODE_EXPIRED = 86038
+
+# 登录轮询的最长等待时间（秒），与二维码有效期一致
+LOGIN_TIMEOUT = 180
+
+
+async def _warmup() -> None:
+    """
+    预先导入登录后才会用到的下载相关模块
+
+    在线程池中执行，不阻塞扫码轮询
+    """
+    loop = asyncio.get_running_loop()
+    for name in ("downloader", "progress"):
+        await loop.run_in_executor(None, importlib.import_module, f"{__package__}.{name}")
+
+
+def _pluck(d: dict, key: str):
+    """
+    从响应中取值，顶层没有时再尝试 data 字段
+
+    Args:
+        d (dict): 响应数据
+        key (str): 键名
+
+    Returns:
+        对应的值，不存在时为 None
+    """
+    value = d.get(key)
+    if value is not None:
+        return value
+    inner = d.get("data")
+    return inner.get(key) if isinstance(inner, dict) else None
 
 
 class QrCodeLoginEvents:
@@ -32,6 +76,8 @@ class QRCodeLogin:
     二维码登录类
     """
 
+    __slots__ = ("wait_forever", "qr_key", "credential")
+
     def __init__(self, wait_forever: bool = False):
         """
         初始化二维码登录
@@ -50,13 +96,12 @@ class QRCodeLogin:
         Returns:
             str: 二维码链接
         """
-        api = API["qrcode"]["web"]["get_qrcode_and_token"]
-        response = await Api(credential=Credential(), **api).result()
+        response = await Api(credential=_ANON_CRED, **_QR_GET).result()
 
         # 提取数据
         data = response.get('data', response)
-        qr_link = data.get("url") or data.get("data", {}).get("url")
-        self.qr_key = data.get("qrcode_key") or data.get("data", {}).get("qrcode_key")
+        qr_link = _pluck(data, "url")
+        self.qr_key = _pluck(data, "qrcode_key")
 
         if not qr_link or not self.qr_key:
             raise Exception(f"无法提取二维码信息: {data}")
@@ -70,8 +115,10 @@ class QRCodeLogin:
         Args:
             qr_link (str): 二维码链接
         """
-        qr = qrcode.QRCode()
+        # 每次新建渲染器：本方法在线程池中执行，共享实例会被并发登录交错修改
+        qr = qrcode.QRCode(box_size=1, border=1)
         qr.add_data(qr_link)
+        qr.make(fit=True)
         qr.print_ascii()
         print("请使用手机 Bilibili App 扫描二维码登录")
 
@@ -82,9 +129,8 @@ class QRCodeLogin:
         Returns:
             dict: 登录状态信息
         """
-        check_api = API["qrcode"]["web"]["get_events"]
         params = {"qrcode_key": self.qr_key}
-        response = await Api(credential=Credential(), **check_api).update_params(**params).result()
+        response = await Api(credential=_ANON_CRED, **_QR_EVENTS).update_params(params).result()
 
         return response.get('data', response)
 
@@ -98,37 +144,35 @@ class QRCodeLogin:
         Returns:
             Credential: 登录凭据
         """
-        cred_url = events.get("url") or events.get("data", {}).get("url")
-        ac_time_value = events.get("refresh_token") or events.get("data", {}).get("refresh_token")
+        cred_url = _pluck(events, "url")
+        ac_time_value = _pluck(events, "refresh_token")
 
         if not cred_url:
             raise Exception(f"无法获取登录凭证URL: {events}")
 
-        # 解析 cookies
-        cookies_list = cred_url.split("?")[1].split("&")
-        sessdata = ""
-        bili_jct = ""
-        dedeuserid = ""
-
-        for cookie in cookies_list:
-            if cookie.startswith("SESSDATA="):
-                sessdata = cookie[9:]
-            elif cookie.startswith("bili_jct="):
-                bili_jct = cookie[9:]
-            elif cookie.startswith("DedeUserID="):
-                dedeuserid = cookie[11:]
+        # 解析 cookies（保留原始编码，不做 URL 解码）
+        query = urlsplit(cred_url).query
+        cookies = dict(item.partition("=")[::2] for item in query.split("&"))
 
         return Credential(
-            sessdata=sessdata,
-            bili_jct=bili_jct,
-            dedeuserid=dedeuserid,
+            sessdata=cookies.get("SESSDATA", ""),
+            bili_jct=cookies.get("bili_jct", ""),
+            dedeuserid=cookies.get("DedeUserID", ""),
             ac_time_value=ac_time_value
         )
     async def auto_login(self):
         # 生成并显示二维码
         qr_link = await self.generate_qr_code()
-        self.display_qr_code(qr_link)
-        return await self.login(qr_link=qr_link)
+        # 二维码渲染和输出是同步操作，放到线程池中执行避免阻塞事件循环
+        await asyncio.get_running_loop().run_in_executor(None, self.display_qr_code, qr_link)
+
+        # 利用用户扫码的等待时间在后台预热
+        warmup_task = asyncio.create_task(_warmup())
+        try:
+            return await self.login(qr_link=qr_link)
+        finally:
+            # 预热只是优化，其异常不能覆盖登录结果或登录本身的异常
+            await asyncio.gather(warmup_task, return_exceptions=True)
 
     async def login(self, qr_link: str = None) -> Credential:
         """
@@ -137,27 +181,47 @@ class QRCodeLogin:
         Returns:
             Credential: 登录凭据
         """
-        # 轮询检查登录状态
-        max_attempts = float('inf') if self.wait_forever else 100
+        # 轮询检查登录状态：未扫描时从 1 秒逐步退避到 3 秒，已扫描后缩短到 0.5 秒
+        loop = asyncio.get_running_loop()
+        deadline = None if self.wait_forever else loop.time() + LOGIN_TIMEOUT
         attempt = 0
+        delay = 1.0
+        scanned = False
 
-        while attempt < max_attempts:
-            await asyncio.sleep(3)
+        while deadline is None or loop.time() < deadline:
+            await asyncio.sleep(delay)
             attempt += 1
 
             events = await self.check_login_status()
-            code = events.get("code", events.get("data", {}).get("code"))
+            code = _pluck(events, "code")
 
-            if code == 86101:  # 未扫描
+            if code == CODE_NOT_SCANNED:
                 print(f"等待扫描... (尝试 {attempt})")
+                delay = min(3.0, 1 + 0.5 * attempt)
                 continue
-            elif code == 86090:  # 未确认
-                print("已扫描，请在手机上确认登录")
+            elif code == CODE_NOT_CONFIRMED:
+                if not scanned:
+                    print("已扫描，请在手机上确认登录")
+                    scanned = True
+                delay = 0.5
                 continue
-            elif code == 86038:  # 超时
+            elif code == CODE_EXPIRED:
                 raise Exception("二维码已过期")
             else:  # 登录成功
                 self.credential = self.parse_credential(events)
                 return self.credential
 
-        raise Exception("超过最大等待次数，登录超时")
+        raise Exception("超过最大等待时间，登录超时")
+
+
+async def login_with_qr(wait_forever: bool = False) -> Credential:
+    """
+    二维码登录
+
+    Args:
+        wait_forever (bool): 是否一直等待直到二维码过期
+
+    Returns:
+        Credential: 登录凭据
+    """
+    return await QRCodeLogin(wait_forever=wait_forever).auto_login()
@@ -5,28 +5,44 @@ minimal_bilibili_api.progress
 """
 
 import sys
+import time
+import functools
 from typing import Optional
 from .downloader import DownloadTask
 
 
+# 文件大小单位，下标为以 1024 为底的指数
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+
+@functools.lru_cache(maxsize=256)
+def _format_size(size: int) -> str:
+    """格式化文件大小，按二进制位数直接确定单位"""
+    idx = min(max(0, (size.bit_length() - 1) // 10), len(_SIZE_UNITS) - 1)
+    if idx == 0:
+        return f"{size}B"
+    return "%.1f%s" % (size / (1 << (10 * idx)), _SIZE_UNITS[idx])
+
+
 class SimpleProgressDisplay:
     """简单的进度显示"""
     
-    def __init__(self, show_speed: bool = True):
+    def __init__(self, show_speed: bool = True, min_interval: float = 0.05):
+        """
+        Args:
+            show_speed (bool): 是否显示下载速度
+            min_interval (float): 下载中两次刷新的最小间隔（秒），默认约 20 Hz
+        """
         self.show_speed = show_speed
+        self.min_interval = min_interval
+        self.last_print = 0.0
         self.last_time = 0
         self.last_downloaded = 0
+        self._last_render = None
     
     def format_size(self, size: int) -> str:
         """格式化文件大小"""
-        if size < 1024:
-            return f"{size}B"
-        elif size < 1024 * 1024:
-            return f"{size/1024:.1f}KB"
-        elif size < 1024 * 1024 * 1024:
-            return f"{size/(1024*1024):.1f}MB"
-        else:
-            return f"{size/(1024*1024*1024):.1f}GB"
+        return _format_size(size)
     
     def format_speed(self, speed: float) -> str:
         """格式化下载速度"""
@@ -44,18 +60,29 @@ class SimpleProgressDisplay:
             print(f"⏳ 准备下载 {task.filename}...")
             return
         
+        # 限制刷新频率，终止状态不受影响
+        current_time = time.monotonic()
+        if current_time - self.last_print < self.min_interval:
+            return
+        self.last_print = current_time
+        
         # 计算进度
         if task.total_size > 0:
             progress = (task.downloaded / task.total_size) * 100
             bar_length = 30
             filled_length = int(bar_length * progress // 100)
+            
+            # 进度条和百分比（精确到 0.1%）都未变化时不重绘
+            render_key = (filled_length, int(progress * 10))
+            if render_key == self._last_render:
+                return
+            self._last_render = render_key
+            
             bar = '█' * filled_length + '-' * (bar_length - filled_length)
             
             # 计算速度
             speed_str = ""
             if self.show_speed:
-                import time
-                current_time = time.time()
                 if self.last_time > 0:
                     time_diff = current_time - self.last_time
                     if time_diff > 0:
@@ -112,14 +139,25 @@ def create_simple_progress_callback():
 
 
 def create_batch_progress_callback():
-    """创建批量进度回调"""
+    """创建批量进度回调，回调的 display 属性为对应的显示对象"""
     display = BatchProgressDisplay()
-    return lambda current, total, title: display.update_progress(current, total, title)
 
+    def callback(current, total, title):
+        display.update_progress(current, total, title)
 
-def finish_batch_display(result: dict):
-    """完成批量显示"""
-    display = BatchProgressDisplay()
+    callback.display = display
+    return callback
+
+
+def finish_batch_display(result: dict, callback=None):
+    """
+    完成批量显示
+
+    Args:
+        result (dict): 批量下载结果
+        callback: create_batch_progress_callback 返回的回调，传入时复用其显示对象
+    """
+    display = getattr(callback, "display", None) or BatchProgressDisplay()
     display.finish(result["success"], result["failed"], result.get("errors", []))
 
 
@@ -6,6 +6,8 @@ av 号和 bv 号互转，代码来源：https://www.zhihu.com/question/381784377
 此部分代码以 WTFPL 开源。
 """
 
+from functools import lru_cache
+
 XOR_CODE = 23442827791579
 MASK_CODE = 2251799813685247
 MAX_AID = 1 << 51
@@ -75,7 +77,11 @@ BASE = 58
 BV_LEN = 12
 PREFIX = "BV1"
 
+# 字符到下标的查找表
+_DECODE_TABLE = {c.decode(): i for i, c in enumerate(data)}
+
 
+@lru_cache(maxsize=4096)
 def bvid2aid(bvid: str) -> int:
     """
     BV 号转 AV 号。
@@ -84,14 +90,14 @@ def bvid2aid(bvid: str) -> int:
     Returns:
         int: AV 号。
     """
+    if len(bvid) != BV_LEN or bvid[:3].upper() != PREFIX:
+        raise ValueError("非法 BV 号")
     bvid = list(bvid)
     bvid[3], bvid[9] = bvid[9], bvid[3]
     bvid[4], bvid[7] = bvid[7], bvid[4]
-    bvid = bvid[3:]
     tmp = 0
-    for i in bvid:
-        idx = data.index(i.encode())
-        tmp = tmp * BASE + idx
+    for i in bvid[3:]:
+        tmp = tmp * BASE + _DECODE_TABLE[i]
     return (tmp & MASK_CODE) ^ XOR_CODE
 
 
@@ -5,44 +5,170 @@ minimal_bilibili_api.utils.network
 """
 
 import asyncio
+import collections
+import contextlib
+import http.cookiejar
 import json
+import os
 import time
+import types
 import uuid
-from typing import Dict, Optional, Union
-from dataclasses import dataclass
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Union
+from dataclasses import dataclass, field
+from weakref import WeakKeyDictionary
 
 from curl_cffi import requests
 
+from .utils import DATACLASS_SLOTS, json_loads
 
-# 默认请求头
-HEADERS = {
+
+# 默认请求头（只读，需要修改时请先复制）
+HEADERS = types.MappingProxyType({
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0",
     "Referer": "https://www.bilibili.com/",
-}
+})
+
+# 批量请求元数据（收藏夹分页、视频下载链接等）时的并发上限，避免触发风控
+METADATA_CONCURRENCY = 16
+
+# 下载写入缓冲区大小，攒满后一次性写入磁盘并回调进度
+WRITE_BUFFER_SIZE = 1 << 20
+
+# 超过该大小且服务器支持 Range 时分段并发下载
+RANGED_THRESHOLD = 32 << 20
+
+# 分段并发下载的默认连接数
+RANGED_PARTS = 4
+
+# 分段下载时每个 Range 请求的大小，各连接从队列中依次领取；
+# 首个请求同时用于获取文件大小和确认服务器支持 Range
+RANGED_CHUNK_SIZE = 8 << 20
+
+# 分段下载时每个分段的写入缓冲区大小；分段与普通下载一样占用下载名额，
+# 因此缓冲总量不超过 download_slots() × RANGED_BUFFER_SIZE
+RANGED_BUFFER_SIZE = 4 << 20
+
+# 分段下载需要按偏移写入，Windows 上没有 os.pwrite
+_HAS_PWRITE = hasattr(os, "pwrite")
+
+# 文件写入线程池，避免磁盘 IO 阻塞事件循环
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bili-io")
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """预分配文件空间，减少磁盘碎片和写入时的元数据更新"""
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        # 非 Linux 平台或文件系统不支持时退化为 truncate
+        os.ftruncate(fd, size)
+
+
+def _pwrite_all(fd: int, buffers: list, offset: int) -> None:
+    """
+    将多个缓冲区按顺序写入文件的指定偏移
+
+    支持 os.pwritev 的平台使用一次向量写入，否则合并后调用 os.pwrite
+
+    Args:
+        fd (int): 文件描述符
+        buffers (list): 待写入的 bytes 列表
+        offset (int): 写入起始偏移
+    """
+    if hasattr(os, "pwritev"):
+        written = os.pwritev(fd, buffers, offset)
+        total = sum(map(len, buffers))
+        if written == total:
+            return
+        # 极少出现的短写：剩余部分合并后继续写入
+        data = b"".join(buffers)[written:]
+        offset += written
+    else:
+        data = b"".join(buffers)
+
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _submit_io(pending: set, fn: Callable, *args) -> "asyncio.Future":
+    """
+    在线程池中执行文件操作，执行期间线程池的 Future 记录在 pending 中
+
+    取消返回的 asyncio Future 不会中断线程中的操作，关闭或截断文件前需先调用 _wait_io
+    """
+    future = _IO_EXECUTOR.submit(fn, *args)
+    pending.add(future)
+    future.add_done_callback(pending.discard)
+    return asyncio.wrap_future(future)
+
+
+async def _wait_io(pending: set) -> None:
+    """等待 pending 中仍在线程池中执行的文件操作结束"""
+    if pending:
+        await asyncio.wait([asyncio.wrap_future(future) for future in list(pending)])
+
+
+def _content_range_total(content_range: str) -> int:
+    """从 Content-Range（如 bytes 0-99/1000）中取出文件总大小，未知时返回 0"""
+    total = content_range.rpartition("/")[2]
+    return int(total) if total.isdigit() else 0
+
+
+def _remove_quietly(filepath: str) -> None:
+    """删除文件，文件不存在时忽略"""
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+
+def _open_preallocated(filepath: str, size: int) -> int:
+    """以写入模式打开文件并预分配空间，返回文件描述符"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filepath, flags, 0o644)
+    try:
+        _preallocate(fd, size)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
 
 
 class DownloadClient:
     """
-    简化的下载客户端
+    简化的下载客户端，与 Api 共用同一个会话和连接池
+
+    每个下载连接（包括分段下载的每个分段）占用 sem 的一个名额，
+    名额数为 download_slots()，其余连接留给 Api 请求
     """
     def __init__(self):
         self.downloads = {}
         self.download_cnt = 0
+        self.slots = download_slots()
+        self.sem = asyncio.Semaphore(self.slots)
         
     async def download_create(self, url: str, headers: dict = None) -> int:
         """
         创建下载任务
+
+        会话已默认携带 HEADERS，headers 只需传入额外的请求头；
+        创建时占用一个并发名额，在 download_close 中释放
         """
-        if headers is None:
-            headers = HEADERS.copy()
-        
+        await self.sem.acquire()
+        try:
+            resp = await get_session().get(url, headers=headers, stream=True)
+        except BaseException:
+            self.sem.release()
+            raise
         self.download_cnt += 1
-        session = requests.AsyncSession()
-        resp = await session.get(url, headers=headers)
         self.downloads[self.download_cnt] = {
             "response": resp,
-            "session": session,
-            "content_iter": resp.aiter_bytes()
+            "content_iter": resp.aiter_content()
         }
         return self.download_cnt
     
@@ -69,27 +195,402 @@ class DownloadClient:
         """
         关闭下载连接
         """
-        download_info = self.downloads[cnt]
-        await download_info["session"].close()
-        del self.downloads[cnt]
+        download_info = self.downloads.pop(cnt)
+        try:
+            await download_info["response"].aclose()
+        finally:
+            self.sem.release()
+
+    async def download_to_file(self, url: str, filepath: str, headers: dict = None,
+                               on_progress: Callable[[int, int], None] = None,
+                               session: requests.AsyncSession = None) -> int:
+        """
+        流式下载到文件
+
+        数据块先合并到缓冲区，每攒满 WRITE_BUFFER_SIZE 在线程池中写入一次并回调进度；
+        文件超过 RANGED_THRESHOLD 且服务器支持 Range 时改为分段并发下载
+
+        Args:
+            url (str): 下载链接
+            filepath (str): 保存路径
+            headers (dict): 额外的请求头，会覆盖会话默认的 HEADERS
+            on_progress (Callable[[int, int], None]): 进度回调，参数为 (已下载字节数, 总字节数)
+            session (AsyncSession): 使用的会话，为空时使用共享会话
+
+        Returns:
+            int: 下载的字节数
+        """
+        if session is None:
+            session = get_session()
+
+        async with self.sem:
+            return await self._download_to_file(url, filepath, headers, on_progress, session)
+
+    async def _acquire_free(self, count: int) -> int:
+        """
+        不等待地占用至多 count 个空闲名额
+
+        分段下载的额外分段只使用当前空闲的名额，等待名额可能与其他持有名额的下载互相等待而死锁
+
+        Returns:
+            int: 实际占用的名额数
+        """
+        acquired = 0
+        while acquired < count and not self.sem.locked():
+            # 有空闲名额时 acquire 不会挂起
+            await self.sem.acquire()
+            acquired += 1
+        return acquired
+
+    def _release(self, count: int) -> None:
+        """
+        释放 count 个名额
+        """
+        for _ in range(count):
+            self.sem.release()
+
+    async def _download_to_file(self, url: str, filepath: str, headers: dict,
+                                on_progress: Callable[[int, int], None],
+                                session: requests.AsyncSession) -> int:
+        """
+        download_to_file 的实现，调用方需已持有一个名额
+        """
+        if not _HAS_PWRITE:
+            async with session.stream("GET", url, headers=headers) as resp:
+                if resp.status_code != 200:
+                    raise Exception(f"HTTP 错误: {resp.status_code}")
+                total_size = int(resp.headers.get("content-length", "0"))
+                return await self._write_stream(resp, filepath, total_size, on_progress)
+
+        # 首个请求只取第一个分块，由 206 响应的 Content-Range 得到文件大小后再决定是否分段；
+        # curl_cffi 关闭响应时会读完剩余内容，不能先发起完整的 GET 再放弃
+        first_headers = dict(headers) if headers else {}
+        first_headers["Range"] = f"bytes=0-{RANGED_CHUNK_SIZE - 1}"
+        async with contextlib.AsyncExitStack() as stack:
+            resp = await stack.enter_async_context(
+                session.stream("GET", url, headers=first_headers)
+            )
+            if resp.status_code == 200:
+                # 服务器忽略了 Range，返回的就是完整内容
+                total_size = int(resp.headers.get("content-length", "0"))
+                return await self._write_stream(resp, filepath, total_size, on_progress)
+            if resp.status_code != 206:
+                raise Exception(f"HTTP 错误: {resp.status_code}")
+
+            total_size = _content_range_total(resp.headers.get("content-range", ""))
+            if total_size <= 0:
+                raise Exception("无法获取文件大小")
+            if total_size <= RANGED_CHUNK_SIZE:
+                # 第一个分块已包含整个文件
+                return await self._write_stream(resp, filepath, total_size, on_progress)
+
+            # 已收到的第一个分块作为分段之一继续读取；只有大文件才占用额外名额并发下载其余分块
+            extra = await self._acquire_free(RANGED_PARTS - 1) if total_size > RANGED_THRESHOLD else 0
+            # 响应的关闭转交给读取它的连接，读完第一个分块后即关闭，再领取其余分块
+            first = (resp, stack.pop_all())
+
+        try:
+            return await self._download_ranged(
+                url, filepath, 1 + extra, headers, on_progress, session, total_size, first=first
+            )
+        finally:
+            self._release(extra)
+
+    async def _write_stream(self, resp, filepath: str, total_size: int,
+                            on_progress: Callable[[int, int], None] = None) -> int:
+        """
+        将流式响应写入文件
+
+        Returns:
+            int: 写入的字节数
+        """
+        downloaded = 0
+        loop = asyncio.get_running_loop()
+
+        # 打开、预分配、写入、截断和关闭文件都在线程池中执行
+        f = await loop.run_in_executor(_IO_EXECUTOR, open, filepath, "wb")
+        pending = set()
+        try:
+            if total_size > 0:
+                await _submit_io(pending, _preallocate, f.fileno(), total_size)
+
+            buffer = bytearray()
+            async for chunk in resp.aiter_content():
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await _submit_io(pending, f.write, buffer)
+                    downloaded += len(buffer)
+                    buffer.clear()
+                    if on_progress:
+                        on_progress(downloaded, total_size)
+
+            if buffer:
+                await _submit_io(pending, f.write, buffer)
+                downloaded += len(buffer)
+        finally:
+            # 被取消时线程池中的写入可能仍在执行，等待其结束后再截断
+            await _wait_io(pending)
+            try:
+                # 截断到实际写入的长度：成功时去掉多余的预分配部分，
+                # 失败时去掉未写入的零填充部分，避免不完整的文件与完整文件大小相同
+                if total_size > 0 and downloaded != total_size:
+                    await loop.run_in_executor(_IO_EXECUTOR, f.truncate, downloaded)
+            finally:
+                await loop.run_in_executor(_IO_EXECUTOR, f.close)
+
+        return downloaded
+
+    async def download_ranged(self, url: str, filepath: str, parts: int = RANGED_PARTS,
+                              headers: dict = None,
+                              on_progress: Callable[[int, int], None] = None,
+                              session: requests.AsyncSession = None,
+                              total_size: int = None) -> int:
+        """
+        使用 HTTP Range 分段并发下载到文件
+
+        文件按 RANGED_CHUNK_SIZE 切成分块，每个连接占用一个下载名额并依次领取分块；
+        数据块在分块内攒满 RANGED_BUFFER_SIZE 后以一次向量写入落到预分配好的文件的对应偏移
+
+        Args:
+            url (str): 下载链接
+            filepath (str): 保存路径
+            parts (int): 最大连接数，实际连接数受空闲名额限制
+            headers (dict): 额外的请求头
+            on_progress (Callable[[int, int], None]): 进度回调，参数为 (已下载字节数, 总字节数)
+            session (AsyncSession): 使用的会话，为空时使用共享会话
+            total_size (int): 文件大小，为空时通过 HEAD 请求获取
+
+        Returns:
+            int: 下载的字节数
+        """
+        if session is None:
+            session = get_session()
+
+        async with self.sem:
+            extra = await self._acquire_free(parts - 1)
+            try:
+                return await self._download_ranged(
+                    url, filepath, 1 + extra, headers, on_progress, session, total_size
+                )
+            finally:
+                self._release(extra)
+
+    async def _download_ranged(self, url: str, filepath: str, parts: int, headers: dict,
+                               on_progress: Callable[[int, int], None],
+                               session: requests.AsyncSession, total_size: Optional[int],
+                               first: tuple = None) -> int:
+        """
+        download_ranged 的实现，调用方需已为每个连接持有一个名额
+
+        first 为已打开的 bytes=0-(RANGED_CHUNK_SIZE - 1) 的 206 响应及负责关闭它的 AsyncExitStack，
+        由第一个连接读取并关闭
+        """
+        if total_size is None:
+            resp = await session.head(url, headers=headers)
+            total_size = int(resp.headers.get("content-length", "0"))
+            if total_size <= 0:
+                raise Exception("无法获取文件大小")
+
+        # 只有一个连接时剩余部分用一个请求下载，不再切分
+        chunk_size = RANGED_CHUNK_SIZE if parts > 1 else total_size
+        begin = RANGED_CHUNK_SIZE if first is not None else 0
+        chunks = collections.deque(
+            (start, min(start + chunk_size, total_size) - 1)
+            for start in range(begin, total_size, chunk_size)
+        )
+
+        loop = asyncio.get_running_loop()
+        downloaded = 0
+        failed = False
+        pending = set()
+
+        async def write(buffers: list, offset: int) -> None:
+            await _submit_io(pending, _pwrite_all, fd, buffers, offset)
+
+        async def receive(resp, start: int, end: int) -> None:
+            nonlocal downloaded
+            if resp.status_code != 206:
+                raise Exception(f"HTTP 错误: {resp.status_code}")
+
+            offset = start
+            buffers = []
+            buffered = 0
+            async for chunk in resp.aiter_content():
+                buffers.append(chunk)
+                buffered += len(chunk)
+                if buffered >= RANGED_BUFFER_SIZE:
+                    await write(buffers, offset)
+                    offset += buffered
+                    downloaded += buffered
+                    buffers = []
+                    buffered = 0
+                    if on_progress:
+                        on_progress(downloaded, total_size)
+
+            if buffers:
+                await write(buffers, offset)
+                offset += buffered
+                downloaded += buffered
+                if on_progress:
+                    on_progress(downloaded, total_size)
+
+            if offset != end + 1:
+                raise Exception(f"分段下载不完整: {start}-{end}")
+
+        async def worker(first: tuple = None) -> None:
+            nonlocal failed
+            try:
+                if first is not None:
+                    resp, stack = first
+                    async with stack:
+                        await receive(resp, 0, RANGED_CHUNK_SIZE - 1)
+                # 其他连接失败后不再领取新的分块；已打开的响应关闭时仍会被 curl_cffi 读完，
+                # 因此失败时多余的流量不超过每个连接一个分块
+                while chunks and not failed:
+                    start, end = chunks.popleft()
+                    range_headers = dict(headers) if headers else {}
+                    range_headers["Range"] = f"bytes={start}-{end}"
+                    async with session.stream("GET", url, headers=range_headers) as resp:
+                        await receive(resp, start, end)
+            except BaseException:
+                failed = True
+                raise
+
+        try:
+            fd = await loop.run_in_executor(_IO_EXECUTOR, _open_preallocated, filepath, total_size)
+        except BaseException:
+            if first is not None:
+                await first[1].aclose()
+            raise
+        completed = False
+        try:
+            results = await asyncio.gather(
+                worker(first), *[worker() for _ in range(parts - 1)],
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            completed = True
+        finally:
+            # 被取消时线程池中的写入可能仍在执行，全部结束后再关闭文件，避免写入已关闭的描述符
+            await _wait_io(pending)
+            await loop.run_in_executor(_IO_EXECUTOR, os.close, fd)
+            if not completed:
+                # 各分块之间留有未写入的零填充空洞，无法截断成有效的前缀，直接删除
+                await loop.run_in_executor(_IO_EXECUTOR, _remove_quietly, filepath)
+
+        return downloaded
 
 
 def get_client() -> DownloadClient:
     """
-    获取下载客户端实例
+    获取当前事件循环的下载客户端实例
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = DownloadClient()
+        _clients[loop] = client
+    return client
+
+
+# 按事件循环区分的下载客户端和共享会话，避免会话被其他事件循环复用
+_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, DownloadClient]" = WeakKeyDictionary()
+_sessions: "WeakKeyDictionary[asyncio.AbstractEventLoop, requests.AsyncSession]" = WeakKeyDictionary()
+
+
+class _DiscardCookieJar(http.cookiejar.CookieJar):
+    """
+    不保存任何 cookie 的 CookieJar
+
+    共享会话被不同凭据（包括匿名凭据）复用，响应设置的 cookie（如扫码登录成功后的 SESSDATA）
+    若被保存，会随之后所有请求发出；每个请求只应携带自身 Credential 的 cookies
+    """
+
+    def set_cookie(self, cookie):
+        pass
+
+    def set_cookie_if_ok(self, cookie, request):
+        pass
+
+    def extract_cookies(self, response, request):
+        pass
+
+
+# 共享会话的连接池大小，通过 set_max_clients 修改
+_max_clients = 64
+
+
+def download_slots() -> int:
+    """
+    下载客户端可同时占用的连接数，为连接池大小的一半，其余连接留给 Api 请求
     """
-    # 使用全局单例
-    global _download_client
-    if _download_client is None:
-        _download_client = DownloadClient()
-    return _download_client
+    return max(1, _max_clients // 2)
 
 
-# 全局下载客户端实例
-_download_client = None
+def set_max_clients(max_clients: int) -> None:
+    """
+    设置共享会话的连接池大小
 
+    只对之后创建的会话和下载客户端生效，应在发起任何请求之前调用；
+    已有会话或下载客户端时发出警告，新的大小会在 close_session 后重新创建会话时生效
+
+    Args:
+        max_clients (int): 连接池最大并发连接数
+    """
+    global _max_clients
+    if max_clients < 1:
+        raise Exception("连接池大小必须大于 0")
+    if (_sessions or _clients) and max_clients != _max_clients:
+        warnings.warn("共享会话已创建，新的连接池大小需在 close_session 后才会生效", stacklevel=2)
+    _max_clients = max_clients
 
-@dataclass
+
+def get_session() -> requests.AsyncSession:
+    """
+    获取当前事件循环的共享异步会话（首次调用时创建）
+
+    复用同一会话可以保持 keep-alive 连接，避免每次请求都重新进行 TCP/TLS 握手；
+    会话模拟 Chrome 131 的 TLS 指纹并默认携带 HEADERS，且不保存响应设置的 cookie；
+    连接池大小由 set_max_clients 设置
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None:
+        session = requests.AsyncSession(
+            impersonate="chrome131",
+            headers=dict(HEADERS),
+            cookies=_DiscardCookieJar(),
+            max_clients=_max_clients
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_session() -> None:
+    """
+    关闭当前事件循环的共享会话，应在程序退出前调用
+
+    下载客户端随会话一起丢弃，之后重新创建时使用最新的连接池设置
+    """
+    loop = asyncio.get_running_loop()
+    _clients.pop(loop, None)
+    session = _sessions.pop(loop, None)
+    if session is not None:
+        await session.close()
+
+
+# 凭据字段与 cookie 名称的对应关系
+_COOKIE_FIELDS = {
+    "sessdata": "SESSDATA",
+    "bili_jct": "bili_jct",
+    "dedeuserid": "DedeUserID",
+    "buvid3": "buvid3",
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Credential:
     """
     凭据类，用于保存登录信息
@@ -99,6 +600,26 @@ class Credential:
     dedeuserid: str = ""
     ac_time_value: str = ""
     buvid3: str = ""
+    _cookies: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # 修改凭据字段后使缓存的 cookies 失效
+        if name in _COOKIE_FIELDS:
+            object.__setattr__(self, "_cookies", None)
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """
+        请求使用的 cookies，结果会被缓存，请勿修改返回的字典
+        """
+        if self._cookies is None:
+            self._cookies = {
+                cookie: getattr(self, name)
+                for name, cookie in _COOKIE_FIELDS.items()
+                if getattr(self, name)
+            }
+        return self._cookies
 
     def has_sessdata(self) -> bool:
         return self.sessdata != ""
@@ -126,6 +647,8 @@ class Api:
     """
     API 请求类
     """
+
+    __slots__ = ("url", "method", "credential", "params", "data", "headers", "wbi")
     
     def __init__(self, url: str, method: str = "GET", credential: Optional[Credential] = None, 
                  params: Dict = None, data: Dict = None, headers: Dict = None, wbi: bool = False):
@@ -137,8 +660,11 @@ class Api:
         self.headers = headers if headers is not None else {}
         self.wbi = wbi
             
-    def update_params(self, **kwargs):
-        self.params.update(kwargs)
+    def update_params(self, params: Dict = None, **kwargs):
+        if params:
+            self.params.update(params)
+        if kwargs:
+            self.params.update(kwargs)
         return self
         
     def update_data(self, **kwargs):
@@ -151,54 +677,69 @@ class Api:
         
     async def result(self):
         """执行请求并返回结果"""
-        # 添加默认 headers
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Referer": "https://www.bilibili.com/",
-        }
-        headers.update(self.headers)
+        # 会话已默认携带 HEADERS，这里只传入额外的请求头
+        headers = self.headers or None
         
         # 添加认证信息
-        cookies = {}
-        if self.credential:
-            if self.credential.sessdata:
-                cookies["SESSDATA"] = self.credential.sessdata
-            if self.credential.bili_jct:
-                cookies["bili_jct"] = self.credential.bili_jct
-            if self.credential.dedeuserid:
-                cookies["DedeUserID"] = self.credential.dedeuserid
-            if self.credential.buvid3:
-                cookies["buvid3"] = self.credential.buvid3
+        cookies = self.credential.cookies if self.credential else None
                 
-        # 发起请求
-        session = requests.AsyncSession()
+        # 复制一份参数，同一实例被复用时后续的 update_params 不会影响进行中的请求
+        params = dict(self.params)
+
+        # 发起请求（复用共享会话）
+        session = get_session()
+        if self.method.upper() == "GET":
+            resp = await session.get(
+                self.url,
+                params=params,
+                headers=headers,
+                cookies=cookies
+            )
+        else:
+            resp = await session.post(
+                self.url,
+                params=params,
+                data=self.data,
+                headers=headers,
+                cookies=cookies
+            )
+
+        return _parse_response(resp)
+
+
+def _parse_response(resp):
+    """
+    解析响应，HTTP 状态码或 API 返回码异常时抛出异常
+    """
+    if resp.status_code == 200:
         try:
-            if self.method.upper() == "GET":
-                resp = await session.get(
-                    self.url,
-                    params=self.params,
-                    headers=headers,
-                    cookies=cookies
-                )
-            else:
-                resp = await session.post(
-                    self.url,
-                    params=self.params,
-                    data=self.data,
-                    headers=headers,
-                    cookies=cookies
-                )
-                
-            # 解析响应
-            if resp.status_code == 200:
-                try:
-                    result = resp.json()
-                    if isinstance(result, dict) and result.get("code", 0) != 0:
-                        raise Exception(f"API 错误: {result.get('message', '未知错误')}")
-                    return result
-                except json.JSONDecodeError:
-                    return resp.text
-            else:
-                raise Exception(f"HTTP 错误: {resp.status_code}")
-        finally:
-            await session.close()
\ No newline at end of file
+            result = json_loads(resp.content)
+            if isinstance(result, dict) and result.get("code", 0) != 0:
+                raise Exception(f"API 错误: {result.get('message', '未知错误')}")
+            return result
+        except json.JSONDecodeError:
+            return resp.text
+    else:
+        raise Exception(f"HTTP 错误: {resp.status_code}")
+
+
+async def get_json(url: str, params: Dict = None, credential: Optional[Credential] = None):
+    """
+    发起简单的 GET 请求并返回解析后的结果
+
+    适用于不需要 wbi 签名的请求，省去构造 Api 对象的开销
+
+    Args:
+        url (str): 请求地址
+        params (dict): 查询参数
+        credential (Credential): 凭据
+
+    Returns:
+        请求结果
+    """
+    resp = await get_session().get(
+        url,
+        params=params,
+        cookies=credential.cookies if credential else None
+    )
+    return _parse_response(resp)
@@ -4,14 +4,33 @@ minimal_bilibili_api.utils.utils
 精简版通用工具库
 """
 
+import functools
 import json
 import os
+import sys
 from typing import List, TypeVar
 
 
+# 优先使用 orjson 解析 JSON，未安装时退回标准库
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# dataclass 的 slots 参数需要 Python 3.10+，低版本时不启用
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# API 配置文件目录
+_API_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "api"))
+
+
+@functools.lru_cache(maxsize=None)
 def get_api(field: str, *args) -> dict:
     """
     获取 API 配置
+
+    结果会被缓存并在调用方之间共享，请勿修改返回的字典
     
     Args:
         field (str): API 所属分类
@@ -19,14 +38,10 @@ def get_api(field: str, *args) -> dict:
     Returns:
         dict: API 配置
     """
-    path = os.path.abspath(
-        os.path.join(
-            os.path.dirname(__file__), "..", "data", "api", f"{field.lower()}.json"
-        )
-    )
+    path = os.path.join(_API_DATA_DIR, f"{field.lower()}.json")
     if os.path.exists(path):
-        with open(path, encoding="utf8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
             for arg in args:
                 data = data[arg]
             return data
@@ -45,7 +60,7 @@ def join(seperator: str, array: list):
     Returns:
         str: 连接结果
     """
-    return seperator.join(map(lambda x: str(x), array))
+    return seperator.join(map(str, array))
 
 
 def raise_for_statement(statement: bool, msg: str = "未满足条件") -> None:
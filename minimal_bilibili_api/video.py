@@ -4,15 +4,40 @@ minimal_bilibili_api.video
 视频相关功能
 """
 
-import re
-from typing import Union, List, Optional
+import asyncio
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 from .utils.utils import get_api
-from .utils.network import Api, Credential, get_client, HEADERS
+from .utils.aid_bvid_transformer import bvid2aid
+from .utils.network import METADATA_CONCURRENCY, Api, Credential, get_json
 
 
 API = get_api("video")
+_INFO_API = API["info"]["info"]
+_PAGES_API = API["info"]["pages"]
+
+# 视频清晰度 ID 与名称的映射
+_QUALITY_MAP = {
+    16: "360P", 32: "480P", 64: "720P",
+    80: "1080P", 112: "1080P+", 116: "1080P60",
+    120: "4K", 125: "HDR", 126: "杜比视界", 127: "8K"
+}
+
+
+# downloader 模块依赖本模块，首次使用时再导入并缓存
+_downloader_classes = None
+
+
+def _get_downloader() -> tuple:
+    """
+    获取 (VideoDownloader, ProgressCallback)
+    """
+    global _downloader_classes
+    if _downloader_classes is None:
+        from .downloader import VideoDownloader, ProgressCallback
+        _downloader_classes = (VideoDownloader, ProgressCallback)
+    return _downloader_classes
 
 
 class AudioQuality(Enum):
@@ -25,39 +50,42 @@ class AudioQuality(Enum):
     HI_RES = 30251
     DOLBY = 30255
     
+    # 定义了比较运算，显式保留 Enum 的哈希以便继续用作字典键
+    __hash__ = Enum.__hash__
+
     def __le__(self, other):
         """支持 <= 比较操作"""
         if isinstance(other, AudioQuality):
-            # 按照音质从低到高排序：64K < 132K < 192K < HI_RES < DOLBY
-            quality_order = [
-                AudioQuality._64K,
-                AudioQuality._132K, 
-                AudioQuality._192K,
-                AudioQuality.HI_RES,
-                AudioQuality.DOLBY
-            ]
-            return quality_order.index(self) <= quality_order.index(other)
+            return self._rank <= other._rank
         return NotImplemented
-    
+
     def __lt__(self, other):
         """支持 < 比较操作"""
         if isinstance(other, AudioQuality):
-            quality_order = [
-                AudioQuality._64K,
-                AudioQuality._132K,
-                AudioQuality._192K,
-                AudioQuality.HI_RES,
-                AudioQuality.DOLBY
-            ]
-            return quality_order.index(self) < quality_order.index(other)
+            return self._rank < other._rank
         return NotImplemented
 
 
+# 按照音质从低到高排序：64K < 132K < 192K < HI_RES < DOLBY
+for _rank, _quality in enumerate((
+    AudioQuality._64K,
+    AudioQuality._132K,
+    AudioQuality._192K,
+    AudioQuality.HI_RES,
+    AudioQuality.DOLBY,
+)):
+    _quality._rank = _rank
+del _rank, _quality
+
+
 @dataclass
 class AudioStream:
     """
     音频流信息
     """
+    # 手写 __slots__ 以兼容不支持 dataclass(slots=True) 的 Python 3.8/3.9
+    __slots__ = ("url", "quality")
+
     url: str
     quality: AudioQuality
 
@@ -70,6 +98,8 @@ class VideoStream:
     """
     视频流信息
     """
+    __slots__ = ("url", "quality")
+
     url: str
     quality: str
 
@@ -83,42 +113,45 @@ class VideoDownloadParser:
     """
 
     def __init__(self, data: dict):
-        self.data = data
         # 处理可能的包装格式
-        if "data" in self.data:
-            self.data = self.data["data"]
-        if self.data.get("video_info"):  # bangumi
-            self.data = self.data["video_info"]
+        if "data" in data:
+            data = data["data"]
+        if data.get("video_info"):  # bangumi
+            data = data["video_info"]
+        self.data = data
+
+        # 预先取出各方法都会用到的字段
+        self._dash = data.get("dash")
+        self._durl = data.get("durl")
+        self._format = data.get("format") or ""
 
     def is_dash_stream(self) -> bool:
         """
         判断是否为 DASH 流（音视频分离）
         """
-        return "dash" in self.data
+        return self._dash is not None
 
     def is_flv_stream(self) -> bool:
         """
         判断是否为 FLV 流
         """
-        return "durl" in self.data and self.data.get("format", "").startswith("flv")
+        return self._durl is not None and self._format.startswith("flv")
 
-    def get_audio_streams(self) -> List[AudioStream]:
+    def _iter_audio(self):
         """
-        获取所有音频流
+        按 普通音频、Hi-Res、杜比 的顺序遍历音频流，产出 (url, 音质)
         """
-        if not self.is_dash_stream():
-            return []
-
-        streams = []
-        dash_data = self.data["dash"]
+        dash_data = self._dash
+        if dash_data is None:
+            return
 
         # 普通音频流
-        if "audio" in dash_data:
-            for audio_data in dash_data["audio"]:
-                url = audio_data.get("baseUrl") or audio_data.get("base_url", "")
-                if url:
-                    quality = AudioQuality(audio_data["id"])
-                    streams.append(AudioStream(url=url, quality=quality))
+        quality_of = AudioQuality
+        yield from (
+            (url, quality_of(audio_data["id"]))
+            for audio_data in dash_data.get("audio") or ()
+            if (url := audio_data.get("baseUrl") or audio_data.get("base_url"))
+        )
 
         # Hi-Res 音频
         if "flac" in dash_data and dash_data["flac"]:
@@ -126,70 +159,67 @@ class VideoDownloadParser:
             if "audio" in flac_data:
                 url = flac_data["audio"].get("base_url", "")
                 if url:
-                    quality = AudioQuality.HI_RES
-                    streams.append(AudioStream(url=url, quality=quality))
+                    yield url, AudioQuality.HI_RES
 
         # 杜比音频
         if "dolby" in dash_data and dash_data["dolby"]:
             dolby_data = dash_data["dolby"]
-            if "audio" in dolby_data and dolby_data["audio"]:
-                for audio_data in dolby_data["audio"]:
-                    url = audio_data.get("base_url", "")
-                    if url:
-                        quality = AudioQuality.DOLBY
-                        streams.append(AudioStream(url=url, quality=quality))
+            dolby = AudioQuality.DOLBY
+            yield from (
+                (url, dolby)
+                for audio_data in dolby_data.get("audio") or ()
+                if (url := audio_data.get("base_url"))
+            )
 
-        return streams
+    def get_audio_streams(self) -> List[AudioStream]:
+        """
+        获取所有音频流
+        """
+        stream_cls = AudioStream
+        return [stream_cls(url=url, quality=quality) for url, quality in self._iter_audio()]
 
     def get_video_streams(self) -> List[VideoStream]:
         """
         获取所有视频流
         """
-        if not self.is_dash_stream():
+        dash_data = self._dash
+        if dash_data is None:
             return []
 
-        streams = []
-        dash_data = self.data["dash"]
-
-        if "video" in dash_data:
-            for video_data in dash_data["video"]:
-                url = video_data.get("baseUrl") or video_data.get("base_url", "")
-                if url:
-                    quality_id = video_data["id"]
-                    # 简单的质量映射
-                    quality_map = {
-                        16: "360P", 32: "480P", 64: "720P",
-                        80: "1080P", 112: "1080P+", 116: "1080P60",
-                        120: "4K", 125: "HDR", 126: "杜比视界", 127: "8K"
-                    }
-                    quality = quality_map.get(quality_id, f"Quality_{quality_id}")
-                    streams.append(VideoStream(url=url, quality=quality))
-
-        return streams
+        stream_cls = VideoStream
+        quality_map = _QUALITY_MAP
+        return [
+            stream_cls(url=url, quality=quality_map.get(video_data["id"]) or f"Quality_{video_data['id']}")
+            for video_data in dash_data.get("video") or ()
+            if (url := video_data.get("baseUrl") or video_data.get("base_url"))
+        ]
 
     def get_best_audio_stream(self, max_quality: AudioQuality = AudioQuality.DOLBY) -> Optional[AudioStream]:
         """
         获取最佳音频流（优先级：杜比 > Hi-Res > 192K > 132K > 64K）
+
+        只遍历一次音频流且只构造一个 AudioStream；
+        没有不高于 max_quality 的音频流时返回第一个音频流
         """
-        streams = self.get_audio_streams()
-        if not streams:
+        first = None
+        best = None
+        best_rank = -1
+        max_rank = max_quality._rank
+        # 默认上限为最高音质，此时无需逐个比较上限
+        no_cap = max_quality is AudioQuality.DOLBY
+
+        for candidate in self._iter_audio():
+            if first is None:
+                first = candidate
+            rank = candidate[1]._rank
+            if rank > best_rank and (no_cap or rank <= max_rank):
+                best = candidate
+                best_rank = rank
+
+        chosen = best or first
+        if chosen is None:
             return None
-
-        # 按优先级排序
-        priority_order = [
-            AudioQuality.DOLBY,
-            AudioQuality.HI_RES,
-            AudioQuality._192K,
-            AudioQuality._132K,
-            AudioQuality._64K
-        ]
-
-        for quality in priority_order:
-            for stream in streams:
-                if stream.quality == quality and quality <= max_quality:
-                    return stream
-
-        return streams[0] if streams else None
+        return AudioStream(url=chosen[0], quality=chosen[1])
 
     def get_flv_stream(self) -> Optional[VideoStream]:
         """
@@ -198,7 +228,7 @@ class VideoDownloadParser:
         if not self.is_flv_stream():
             return None
 
-        url = self.data["durl"][0].get("url", "")
+        url = self._durl[0].get("url", "")
         return VideoStream(url=url, quality="FLV") if url else None
 
 
@@ -207,17 +237,25 @@ class Video:
     视频类
     """
 
-    def __init__(self, bvid: str = None, aid: int = None, credential: Credential = None):
+    # 收藏夹中每个视频对应一个实例，去掉 __dict__ 以减少大量实例的内存占用
+    __slots__ = ("bvid", "aid", "credential", "_title", "_info_task", "_download_cache", "_api_cache")
+
+    def __init__(self, bvid: str = None, aid: int = None, credential: Credential = None,
+                 title: str = None):
         """
         Args:
             bvid (str): BV 号
             aid (int): AV 号
             credential (Credential): 凭据
+            title (str): 已知的视频标题（如收藏夹列表中已返回），提供后 get_title 不再请求视频信息
         """
         if bvid:
             self.bvid = bvid
-            # 简单的 BV to AV 转换（实际应该更复杂）
-            self.aid = int(bvid[2:], 36) if bvid.startswith('BV') else None
+            try:
+                self.aid = bvid2aid(bvid)
+            except (KeyError, ValueError):
+                # 非法 BV 号，仅使用 bvid 请求
+                self.aid = None
         elif aid:
             self.aid = aid
             self.bvid = None
@@ -225,39 +263,81 @@ class Video:
             raise Exception("必须提供 bvid 或 aid")
 
         self.credential = credential if credential else Credential()
+        self._title: Optional[str] = title
+        self._info_task: Optional[asyncio.Task] = None
+        # 以下缓存在首次使用时才创建
+        self._download_cache: Optional[Dict[int, asyncio.Task]] = None
+        self._api_cache: Optional[Dict[tuple, Api]] = None
+
+    def _api(self, *key_path: str, wbi: bool = False) -> Api:
+        """
+        获取 API 配置对应的 Api 实例（按接口缓存在实例上，调用方通过 update_params 更新参数）
+
+        Args:
+            *key_path (str): 接口在 API 配置中的路径，如 ("info", "playurl")
+            wbi (bool): 是否使用 wbi 签名
+
+        Returns:
+            Api: Api 实例
+        """
+        if self._api_cache is None:
+            self._api_cache = {}
+        key = (key_path, wbi)
+        api = self._api_cache.get(key)
+        if api is None:
+            config = API
+            for name in key_path:
+                config = config[name]
+            api = Api(**config, credential=self.credential, wbi=wbi)
+            self._api_cache[key] = api
+        return api
 
     async def get_info(self) -> dict:
         """
-        获取视频完整信息
+        获取视频完整信息（请求任务缓存在实例上，并发调用共享同一次请求）
 
         Returns:
             dict: 视频信息
         """
-        api = API["info"]["info"]
+        task = self._info_task
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_info())
+            self._info_task = task
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # 请求失败时移除缓存，下次调用重新请求
+            if self._info_task is task:
+                self._info_task = None
+            raise
+
+    async def _fetch_info(self) -> dict:
+        """
+        请求视频完整信息
+        """
         params = {}
         if self.bvid:
             params["bvid"] = self.bvid
         if self.aid:
             params["aid"] = self.aid
 
-        # 分步调用避免链式调用问题
-        api_instance = Api(**api, credential=self.credential)
-        api_instance.update_params(**params)
-        return await api_instance.result()
+        return await get_json(_INFO_API["url"], params, self.credential)
 
     async def get_title(self) -> str:
         """
-        获取视频标题
+        获取视频标题（结果会缓存在实例上）
 
         Returns:
             str: 视频标题
         """
-        info = await self.get_info()
-        return info.get("data", {}).get("title", "") if "data" in info else info.get("title", "")
+        if self._title is None:
+            info = await self.get_info()
+            self._title = info.get("data", {}).get("title", "") if "data" in info else info.get("title", "")
+        return self._title
 
     async def get_download_url(self, page_index: int = 0) -> dict:
         """
-        获取视频下载链接
+        获取视频下载链接（按分 P 缓存请求任务，并发调用共享同一次请求）
 
         Args:
             page_index (int): 分 P 索引，默认为 0
@@ -265,26 +345,55 @@ class Video:
         Returns:
             dict: 下载链接信息
         """
-        # 先获取分 P 信息
-        pages_api = API["info"]["pages"]
+        if self._download_cache is None:
+            self._download_cache = {}
+        task = self._download_cache.get(page_index)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_download_url(page_index))
+            self._download_cache[page_index] = task
+        try:
+            # shield 避免某个调用方被取消时连带取消共享的请求
+            return await asyncio.shield(task)
+        except Exception:
+            # 请求失败时移除缓存，下次调用重新请求
+            if self._download_cache.get(page_index) is task:
+                del self._download_cache[page_index]
+            raise
+
+    async def _fetch_download_url(self, page_index: int) -> dict:
+        """
+        请求视频下载链接
+        """
+        pages = await self._get_pages()
+        if page_index >= len(pages):
+            raise Exception(f"分 P 索引超出范围，共有 {len(pages)} 个分 P")
+
+        return await self._fetch_playurl(pages[page_index]["cid"])
+
+    async def _get_pages(self) -> List[dict]:
+        """
+        获取分 P 列表
+        """
+        if self._info_task is not None:
+            # 视频信息已缓存或正在请求，其中已包含分 P 列表，无需再请求分 P 接口
+            info = await self.get_info()
+            pages = info.get("data", {}).get("pages") if "data" in info else info.get("pages")
+            if pages is not None:
+                return pages
+
         pages_params = {}
         if self.bvid:
             pages_params["bvid"] = self.bvid
         if self.aid:
             pages_params["aid"] = self.aid
 
-        api_instance = Api(**pages_api, credential=self.credential)
-        api_instance.update_params(**pages_params)
-        pages_result = await api_instance.result()
-        pages = pages_result.get("data", []) if "data" in pages_result else pages_result
-
-        if page_index >= len(pages):
-            raise Exception(f"分 P 索引超出范围，共有 {len(pages)} 个分 P")
-
-        cid = pages[page_index]["cid"]
+        pages_result = await get_json(_PAGES_API["url"], pages_params, self.credential)
+        return pages_result.get("data", []) if "data" in pages_result else pages_result
 
-        # 获取下载链接
-        playurl_api = API["info"]["playurl"]
+    async def _fetch_playurl(self, cid: int) -> dict:
+        """
+        请求指定 cid 的下载链接
+        """
         playurl_params = {
             "qn": "127",  # 最高质量
             "fnval": 4048,  # 支持所有格式
@@ -295,9 +404,54 @@ class Video:
             "cid": cid
         }
 
-        api_instance = Api(**playurl_api, credential=self.credential, wbi=True)
-        api_instance.update_params(**playurl_params)
-        return await api_instance.result()
+        return await self._api("info", "playurl", wbi=True).update_params(playurl_params).result()
+
+    async def get_all_download_urls(self, concurrency: int = METADATA_CONCURRENCY) -> List[dict]:
+        """
+        获取所有分 P 的下载链接（分 P 列表只请求一次，各分 P 的下载链接并发请求并缓存在实例上）
+
+        Args:
+            concurrency (int): 最大并发请求数
+
+        Returns:
+            List[dict]: 按分 P 顺序排列的下载链接信息
+        """
+        pages = await self._get_pages()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(cid: int) -> dict:
+            async with semaphore:
+                return await self._fetch_playurl(cid)
+
+        if self._download_cache is None:
+            self._download_cache = {}
+        for page_index, page in enumerate(pages):
+            if page_index not in self._download_cache:
+                self._download_cache[page_index] = asyncio.ensure_future(fetch(page["cid"]))
+
+        return await asyncio.gather(*[self.get_download_url(i) for i in range(len(pages))])
+
+    @staticmethod
+    async def prepare_many(videos: List["Video"], page_index: int = 0,
+                           concurrency: int = METADATA_CONCURRENCY) -> List[dict]:
+        """
+        并发获取多个视频的下载链接，结果同时缓存在各自实例上
+
+        Args:
+            videos (List[Video]): 视频列表
+            page_index (int): 分 P 索引，默认为 0
+            concurrency (int): 最大并发请求数
+
+        Returns:
+            List[dict]: 与 videos 顺序一致的下载链接信息
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def prepare(video: "Video") -> dict:
+            async with semaphore:
+                return await video.get_download_url(page_index)
+
+        return await asyncio.gather(*[prepare(video) for video in videos])
 
     async def get_audio_streams(self, page_index: int = 0) -> List[AudioStream]:
         """
@@ -345,7 +499,7 @@ class Video:
         Returns:
             str: 下载文件路径
         """
-        from .downloader import VideoDownloader, ProgressCallback
+        VideoDownloader, ProgressCallback = _get_downloader()
 
         downloader = VideoDownloader(self, download_dir)
         progress_cb = ProgressCallback(progress_callback) if progress_callback else None
@@ -0,0 +1,31 @@
+"""
+downloader 模块测试，网络请求均被替换为本地假实现
+"""
+
+import asyncio
+
+from minimal_bilibili_api import video as video_module
+from minimal_bilibili_api.downloader import VideoDownloader
+from minimal_bilibili_api.utils.network import Api
+from minimal_bilibili_api.video import Video
+
+
+def test_same_titles_resolve_to_distinct_paths(monkeypatch, tmp_path):
+    async def get_json(url, params=None, credential=None):
+        return {"code": 0, "data": [{"cid": 1}]}
+
+    async def result(self):
+        return {"code": 0, "data": {"dash": {"audio": [{"id": 30280, "baseUrl": "a192"}]}}}
+
+    monkeypatch.setattr(video_module, "get_json", get_json)
+    monkeypatch.setattr(Api, "result", result)
+    videos = [Video(bvid="BV17x411w7KC", title="同名"), Video(bvid="BV1Q541167Qg", title="同名")]
+
+    async def main():
+        return await asyncio.gather(*[
+            VideoDownloader(video, str(tmp_path)).resolve_audio() for video in videos
+        ])
+
+    paths = [path for _, path in asyncio.run(main())]
+    assert len(set(paths)) == 2
+    assert paths[0].endswith("同名_BV17x411w7KC_p1__192K.m4a")
@@ -0,0 +1,284 @@
+"""
+utils.network 下载相关测试，使用本地假会话代替真实请求
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from minimal_bilibili_api.utils import network
+from minimal_bilibili_api.utils.network import DownloadClient
+
+CHUNK = 64 << 10
+
+needs_pwrite = pytest.mark.skipif(not hasattr(os, "pwrite"), reason="分段下载需要 os.pwrite")
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: bytes, headers: dict, fail_at: int = None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers
+        self.fail_at = fail_at
+        self.received = 0
+
+    async def aiter_content(self):
+        while self.received < len(self.body):
+            if self.fail_at is not None and self.received >= self.fail_at:
+                raise OSError("连接中断")
+            await asyncio.sleep(0)
+            chunk = self.body[self.received:self.received + CHUNK]
+            self.received += len(chunk)
+            yield chunk
+
+    async def drain(self):
+        """与 curl_cffi 的 aclose 一样，关闭时读完剩余内容而不是中断传输"""
+        try:
+            async for _ in self.aiter_content():
+                pass
+        except OSError:
+            pass
+
+
+class FakeSession:
+    """
+    假会话，accept_ranges 为假时忽略 Range 返回完整内容，
+    fail_range 为真时不从 0 开始的分段在中途断开；consumed 记录实际传输的字节数
+    """
+
+    def __init__(self, data: bytes, accept_ranges: bool = True, fail_range: bool = False):
+        self.data = data
+        self.accept_ranges = accept_ranges
+        self.fail_range = fail_range
+        self.requests = []
+        self.consumed = 0
+
+    def respond(self, headers) -> FakeResponse:
+        range_header = (headers or {}).get("Range")
+        self.requests.append(range_header)
+        if range_header is None or not self.accept_ranges:
+            return FakeResponse(200, self.data, {"content-length": str(len(self.data))})
+        start, end = map(int, range_header[len("bytes="):].split("-"))
+        end = min(end, len(self.data) - 1)
+        fail_at = CHUNK * 4 if self.fail_range and start > 0 else None
+        return FakeResponse(206, self.data[start:end + 1], {
+            "content-length": str(end + 1 - start),
+            "content-range": f"bytes {start}-{end}/{len(self.data)}",
+        }, fail_at)
+
+    @asynccontextmanager
+    async def stream(self, method, url, headers=None):
+        resp = self.respond(headers)
+        try:
+            yield resp
+        finally:
+            await resp.drain()
+            self.consumed += resp.received
+
+
+@pytest.fixture
+def data():
+    return os.urandom(network.RANGED_THRESHOLD + 12345)
+
+
+def read(path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@needs_pwrite
+def test_download_ranged_output_matches(tmp_path, data):
+    path = str(tmp_path / "out")
+    session = FakeSession(data)
+
+    async def main():
+        return await DownloadClient().download_ranged("url", path, parts=4, session=session,
+                                                      total_size=len(data))
+
+    assert asyncio.run(main()) == len(data)
+    assert len(session.requests) == -(-len(data) // network.RANGED_CHUNK_SIZE)
+    assert session.consumed == len(data)
+    assert read(path) == data
+
+
+@needs_pwrite
+def test_download_to_file_switches_to_ranges(tmp_path, data):
+    path = str(tmp_path / "out")
+    session = FakeSession(data)
+    progress = []
+
+    async def main():
+        return await DownloadClient().download_to_file(
+            "url", path, session=session, on_progress=lambda done, total: progress.append(done)
+        )
+
+    assert asyncio.run(main()) == len(data)
+    # 首个请求只取第一个分块，整个文件只传输一次
+    assert session.requests[0] == f"bytes=0-{network.RANGED_CHUNK_SIZE - 1}"
+    assert len(session.requests) == -(-len(data) // network.RANGED_CHUNK_SIZE)
+    assert session.consumed == len(data)
+    assert progress[-1] == len(data)
+    assert read(path) == data
+
+
+@needs_pwrite
+def test_download_to_file_without_free_slots_uses_two_requests(tmp_path, data):
+    path = str(tmp_path / "out")
+    session = FakeSession(data)
+
+    async def main():
+        client = DownloadClient()
+        taken = await client._acquire_free(client.slots - 1)
+        try:
+            return await client.download_to_file("url", path, session=session)
+        finally:
+            client._release(taken)
+
+    assert asyncio.run(main()) == len(data)
+    assert session.requests[1] == f"bytes={network.RANGED_CHUNK_SIZE}-{len(data) - 1}"
+    assert session.consumed == len(data)
+    assert read(path) == data
+
+
+def test_download_to_file_small_file(tmp_path):
+    path = str(tmp_path / "out")
+    data = os.urandom(12345)
+    session = FakeSession(data)
+
+    assert asyncio.run(DownloadClient().download_to_file("url", path, session=session)) == len(data)
+    assert len(session.requests) == 1
+    assert session.consumed == len(data)
+    assert read(path) == data
+
+
+def test_download_to_file_sequential(tmp_path, data):
+    path = str(tmp_path / "out")
+    session = FakeSession(data, accept_ranges=False)
+
+    assert asyncio.run(DownloadClient().download_to_file("url", path, session=session)) == len(data)
+    assert len(session.requests) == 1
+    assert session.consumed == len(data)
+    assert read(path) == data
+
+
+@needs_pwrite
+def test_pwrite_all_handles_short_writes(tmp_path, monkeypatch):
+    path = str(tmp_path / "out")
+    real_pwrite = os.pwrite
+
+    def short_pwritev(fd, buffers, offset):
+        # 只写入第一个缓冲区的一部分
+        return real_pwrite(fd, buffers[0][:3], offset)
+
+    monkeypatch.setattr(os, "pwritev", short_pwritev, raising=False)
+    monkeypatch.setattr(os, "pwrite", lambda fd, data, offset: real_pwrite(fd, data[:2], offset))
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, 12)
+        network._pwrite_all(fd, [b"abcdef", b"ghij"], 1)
+    finally:
+        os.close(fd)
+    with open(path, "rb") as f:
+        assert f.read() == b"\0abcdefghij\0"
+
+
+@needs_pwrite
+def test_failed_ranged_download_removes_file(tmp_path, data):
+    path = str(tmp_path / "out")
+    session = FakeSession(data, fail_range=True)
+
+    with pytest.raises(OSError):
+        asyncio.run(DownloadClient().download_to_file("url", path, session=session))
+    assert not os.path.exists(path)
+
+
+def test_failed_sequential_download_is_truncated(tmp_path, data):
+    path = str(tmp_path / "out")
+
+    class FailingSession(FakeSession):
+        def respond(self, headers):
+            return FakeResponse(200, self.data, {"content-length": str(len(self.data))},
+                                fail_at=network.WRITE_BUFFER_SIZE * 3)
+
+    with pytest.raises(OSError):
+        asyncio.run(DownloadClient().download_to_file("url", path, session=FailingSession(data)))
+    written = read(path)
+    assert len(written) < len(data)
+    assert written == data[:len(written)]
+
+
+@needs_pwrite
+def test_cancelled_ranged_download_waits_for_writes(tmp_path, data, monkeypatch):
+    path = str(tmp_path / "out")
+    started = threading.Event()
+    finished = threading.Event()
+    errors = []
+    real_pwrite_all = network._pwrite_all
+
+    def slow_pwrite_all(fd, buffers, offset):
+        started.set()
+        time.sleep(0.2)
+        try:
+            real_pwrite_all(fd, buffers, offset)
+        except OSError as e:
+            errors.append(e)
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(network, "_pwrite_all", slow_pwrite_all)
+
+    async def main():
+        task = asyncio.ensure_future(DownloadClient().download_to_file(
+            "url", path, session=FakeSession(data)
+        ))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    # 文件描述符在线程中的写入全部结束后才关闭
+    assert finished.wait(5)
+    assert errors == []
+    assert not os.path.exists(path)
+
+
+@needs_pwrite
+def test_concurrent_downloads_stay_within_slots(tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "RANGED_CHUNK_SIZE", CHUNK * 2)
+    monkeypatch.setattr(network, "RANGED_THRESHOLD", CHUNK * 4)
+    data = os.urandom(CHUNK * 16)
+    active = peak = 0
+
+    class CountingSession(FakeSession):
+        @asynccontextmanager
+        async def stream(self, method, url, headers=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                async with super().stream(method, url, headers) as resp:
+                    yield resp
+            finally:
+                active -= 1
+
+    client = None
+
+    async def main():
+        nonlocal client
+        client = DownloadClient()
+        return await asyncio.gather(*[
+            client.download_to_file("url", str(tmp_path / str(i)), session=CountingSession(data))
+            for i in range(40)
+        ])
+
+    assert asyncio.run(main()) == [len(data)] * 40
+    # 分段下载的每个连接都占用名额，同时打开的连接数不超过名额数
+    assert 1 < peak <= client.slots
+    assert all(read(tmp_path / str(i)) == data for i in range(40))
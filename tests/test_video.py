@@ -0,0 +1,217 @@
+"""
+video 模块测试，网络请求均被替换为本地假实现
+"""
+
+import asyncio
+
+import pytest
+
+from minimal_bilibili_api import video as video_module
+from minimal_bilibili_api.utils.aid_bvid_transformer import aid2bvid, bvid2aid
+from minimal_bilibili_api.utils.network import METADATA_CONCURRENCY, Api, Credential
+from minimal_bilibili_api.video import AudioQuality, Video, VideoDownloadParser
+
+INFO_URL = video_module._INFO_API["url"]
+PAGES_URL = video_module._PAGES_API["url"]
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """
+    替换 get_json 和 Api.result，记录每次请求
+    """
+    calls = []
+    state = {"playurl_failures": 0}
+
+    async def get_json(url, params=None, credential=None):
+        calls.append(url)
+        await asyncio.sleep(0)
+        if url == INFO_URL:
+            return {"code": 0, "data": {"title": "标题", "pages": [{"cid": 11}, {"cid": 22}]}}
+        return {"code": 0, "data": [{"cid": 11}, {"cid": 22}]}
+
+    async def result(self):
+        cid = self.params["cid"]
+        calls.append(("playurl", cid))
+        await asyncio.sleep(0)
+        if state["playurl_failures"]:
+            state["playurl_failures"] -= 1
+            raise Exception("HTTP 错误: 412")
+        return {"code": 0, "data": {"cid": cid}}
+
+    monkeypatch.setattr(video_module, "get_json", get_json)
+    monkeypatch.setattr(Api, "result", result)
+    return calls, state
+
+
+def make_video(**kwargs) -> Video:
+    return Video(bvid="BV17x411w7KC", credential=Credential(), **kwargs)
+
+
+def test_get_title_is_memoized(fake_api):
+    calls, _ = fake_api
+    video = make_video()
+
+    async def main():
+        return [await video.get_title(), await video.get_title()]
+
+    # get_title 必须等待请求结果而不是返回协程
+    assert asyncio.run(main()) == ["标题", "标题"]
+    assert calls == [INFO_URL]
+
+
+def test_get_title_uses_prefilled_title(fake_api):
+    calls, _ = fake_api
+    assert asyncio.run(make_video(title="已知").get_title()) == "已知"
+    assert calls == []
+
+
+def test_get_download_url_shares_concurrent_requests(fake_api):
+    calls, _ = fake_api
+    video = make_video()
+
+    async def main():
+        return await asyncio.gather(video.get_download_url(1), video.get_download_url(1))
+
+    assert asyncio.run(main()) == [{"code": 0, "data": {"cid": 22}}] * 2
+    assert calls == [PAGES_URL, ("playurl", 22)]
+
+
+def test_get_download_url_evicts_failures(fake_api):
+    calls, state = fake_api
+    state["playurl_failures"] = 1
+    video = make_video()
+
+    async def main():
+        with pytest.raises(Exception, match="412"):
+            await video.get_download_url(0)
+        return await video.get_download_url(0)
+
+    assert asyncio.run(main()) == {"code": 0, "data": {"cid": 11}}
+    assert calls.count(("playurl", 11)) == 2
+
+
+def test_get_download_url_reuses_info_pages(fake_api):
+    calls, _ = fake_api
+    video = make_video()
+
+    async def main():
+        return await asyncio.gather(video.get_title(), video.get_download_url(0))
+
+    asyncio.run(main())
+    assert calls == [INFO_URL, ("playurl", 11)]
+
+
+def test_audio_quality_order():
+    order = [AudioQuality._64K, AudioQuality._132K, AudioQuality._192K,
+             AudioQuality.HI_RES, AudioQuality.DOLBY]
+    assert sorted(reversed(order)) == order
+    assert AudioQuality.HI_RES <= AudioQuality.HI_RES < AudioQuality.DOLBY
+
+
+def playurl(audio=(), flac=None, dolby=()):
+    """构造 DASH playurl 响应"""
+    return {"code": 0, "data": {"dash": {
+        "audio": [{"id": quality.value, "baseUrl": url} for url, quality in audio],
+        "flac": {"audio": {"base_url": flac}} if flac else None,
+        "dolby": {"audio": [{"base_url": url} for url in dolby]},
+    }}}
+
+
+def test_best_audio_stream_prefers_highest_quality():
+    data = playurl(
+        audio=[("a64", AudioQuality._64K), ("a192", AudioQuality._192K), ("a132", AudioQuality._132K)],
+        flac="flac",
+        dolby=["dolby"],
+    )
+    parser = VideoDownloadParser(data)
+
+    assert parser.get_best_audio_stream().url == "dolby"
+    assert parser.get_best_audio_stream(AudioQuality.HI_RES).url == "flac"
+    assert parser.get_best_audio_stream(AudioQuality._132K).url == "a132"
+
+
+def test_best_audio_stream_falls_back_to_first_stream():
+    data = playurl(audio=[("a192", AudioQuality._192K), ("a132", AudioQuality._132K)])
+    best = VideoDownloadParser(data).get_best_audio_stream(AudioQuality._64K)
+    assert (best.url, best.quality) == ("a192", AudioQuality._192K)
+
+
+def test_best_audio_stream_without_dash():
+    data = {"data": {"durl": [{"url": "flv"}], "format": "flv"}}
+    parser = VideoDownloadParser(data)
+    assert parser.get_best_audio_stream() is None
+    assert parser.get_flv_stream().url == "flv"
+
+
+def test_get_download_url_rejects_bad_page_index(fake_api):
+    with pytest.raises(Exception, match="分 P 索引超出范围"):
+        asyncio.run(make_video().get_download_url(5))
+
+
+def test_get_all_download_urls(fake_api):
+    calls, _ = fake_api
+    video = make_video()
+
+    async def main():
+        await video.get_download_url(1)
+        return await video.get_all_download_urls()
+
+    assert [r["data"]["cid"] for r in asyncio.run(main())] == [11, 22]
+    assert calls.count(("playurl", 22)) == 1
+
+
+def test_get_all_download_urls_default_concurrency(monkeypatch):
+    active = peak = 0
+
+    async def get_json(url, params=None, credential=None):
+        return {"code": 0, "data": [{"cid": cid} for cid in range(40)]}
+
+    async def result(self):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return {"code": 0, "data": {"cid": self.params["cid"]}}
+
+    monkeypatch.setattr(video_module, "get_json", get_json)
+    monkeypatch.setattr(Api, "result", result)
+    assert len(asyncio.run(make_video().get_all_download_urls())) == 40
+    assert peak == METADATA_CONCURRENCY
+
+
+def test_prepare_many_default_concurrency(monkeypatch):
+    active = peak = 0
+
+    async def get_json(url, params=None, credential=None):
+        return {"code": 0, "data": [{"cid": 1}]}
+
+    async def result(self):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return {"code": 0, "data": {"cid": self.params["cid"]}}
+
+    monkeypatch.setattr(video_module, "get_json", get_json)
+    monkeypatch.setattr(Api, "result", result)
+    videos = [make_video() for _ in range(40)]
+    assert len(asyncio.run(Video.prepare_many(videos))) == 40
+    assert peak == METADATA_CONCURRENCY
+
+
+@pytest.mark.parametrize("bvid, aid", [
+    ("BV17x411w7KC", 170001),
+    ("BV1Q541167Qg", 455017605),
+])
+def test_bvid2aid(bvid, aid):
+    assert bvid2aid(bvid) == aid
+    assert aid2bvid(aid) == bvid
+    assert bvid2aid("bv" + bvid[2:]) == aid
+
+
+@pytest.mark.parametrize("bvid", ["BV17x411w7KCextra", "BV17x411w7K", "AV17x411w7KC", "BV17x411w7K0"])
+def test_invalid_bvid_has_no_aid(bvid):
+    assert Video(bvid=bvid).aid is None